@@ -26,29 +26,39 @@ To collect data from the raw JSON files and update the search results table run
 # Version 1, 2022-07-09
 
 
-from typing import List, Any, Dict, Tuple
+from typing import List, Any, Dict, Tuple, Callable, Iterable, Optional
 import os
 import sys
 import time
 import signal
 import logging
 import random
-import json
 import re
 import datetime
-from urllib.parse import urlparse
+import gzip
+from functools import lru_cache, partial
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, quote_plus
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, UnicodeDammit
+import lxml.html
+from lxml import etree
+import orjson
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pcsv
 
 
 from dateparser.search import search_dates
-from dateparser import parse as parse_dates
+from dateparser.date import DateDataParser
 
 INPUT_DATA_DIR = "/data/project/voter_registration_scraping/input"
 
 SEARCH_URL = "https://publicdatadigger.com/search"
+SEARCH_URL_PARTS = urlparse(SEARCH_URL)
 MAX_RESULTS_ON_SEARCH_PAGE = 10000
 
 SCRAPING_SEARCH_DIR = "/data/project/voter_registration_scraping/output/search"
@@ -59,6 +69,27 @@ if __name__ == '__main__' and not os.path.isdir(LOG_DIR):
     os.makedirs(LOG_DIR)
 
 DATA_DIR = "/data/project/voter_registration_scraping/data"
+MAX_LOAD_WORKERS = 32
+SEARCH_COLUMNS = ['detail_url', 'detail_url_text', 'display_text', 'home_address', 'email_address',
+                  'phone_number', 'birth_date', 'birth_date_text', 'updated_date',
+                  'updated_date_text', 'order_number', 'first_name', 'last_name', 'json_file',
+                  'scrape_date']
+
+# All records are US voter registrations, skip dateparser's language detection
+DATE_LANGUAGES = ['en']
+DDP = DateDataParser(languages=DATE_LANGUAGES)
+DATE_CACHE_SIZE = 65536
+
+MAX_CONCURRENT_REQUESTS = 8
+REQUESTS_PER_SECOND = 2.0
+HTML_COMPRESSLEVEL = 1
+REQUEST_TIMEOUT = 30
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:102.0) Gecko/20100101 Firefox/102.0"
+
+# One session for all requests: connections to publicdatadigger.com are kept alive and reused
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+SESSION.headers.update({'User-Agent': USER_AGENT})
 
 
 
@@ -79,8 +110,8 @@ def complete_url_with_names(fname: str, lname: str) -> str:
     Returns:
         str: Search URL
     """
-    return urlparse(SEARCH_URL) \
-        ._replace(query=f"q={fname.strip().upper()}+{lname.strip().upper()}").geturl()
+    return f"{SEARCH_URL}?q={quote_plus(fname.strip().upper())}" \
+           f"+{quote_plus(lname.strip().upper())}"
 
 
 def complete_url_with_anchor(anchor: Any) -> str:
@@ -92,7 +123,7 @@ def complete_url_with_anchor(anchor: Any) -> str:
     Returns:
         str: Absolute URL
     """
-    return urlparse(SEARCH_URL)._replace(path=anchor.attrs.get('href'), query='').geturl()
+    return SEARCH_URL_PARTS._replace(path=anchor.attrs.get('href'), query='').geturl()
 
 
 def next_text_only(elm: Any) -> str:
@@ -129,24 +160,75 @@ def parent_text_with_nl(elm: Any, delimiter='\n') -> str:
 
 
 def text_with_nl(elm: Any, delimiter='\n') -> str:
-    """Converts DOM object into text string, preserves line breaks
+    """Converts lxml element into text string, preserves line breaks
     with given delimiter.
 
     Args:
-        elm (Any): DOM object
+        elm (Any): lxml element
         delimiter (str, optional): String used to replace line breaks. Defaults to '\n'.
 
     Returns:
         str: Text value of input object
     """
-    for line_break in elm.findAll('br'):
-        line_break.replaceWith(delimiter)
-    return elm.get_text().strip()
+    for line_break in list(elm.iter('br')):
+        line_break.tail = delimiter + (line_break.tail or '')
+        line_break.drop_tree()
+    return elm.text_content().strip()
+
+
+_HAS_DIGIT = re.compile(r'\d')
+_NON_WORD = re.compile(r'[\W]')
+_BORN = re.compile(r'born', re.IGNORECASE)
+_UPDATED = re.compile(r'updated', re.IGNORECASE)
+_ICON_CLASS = re.compile(r'^fa-(home|envelope|phone)$')
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _cached_parse(value: str, date_format: str) -> str:
+    prsdt = DDP.get_date_data(value)['date_obj']
+    return prsdt.strftime(date_format) if prsdt else None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _cached_search(txt: str) -> Tuple:
+    return tuple(search_dates(txt, languages=DATE_LANGUAGES) or ())
+
+
+def parse_date_string(value: str, date_format='%Y-%m-%d') -> str:
+    """Parses date string and formats it. Results are cached, except for strings
+    without digits (e.g. 'today') which depend on the current date.
+
+    Args:
+        value (str): Date string
+        date_format (str, optional): Formatting string for datetime objects. Defaults to '%Y-%m-%d'.
+
+    Returns:
+        str: Formatted date, None if the string could not be parsed
+    """
+    if _HAS_DIGIT.search(value):
+        return _cached_parse(value, date_format)
+    return _cached_parse.__wrapped__(value, date_format)
+
+
+def search_date_strings(txt: str) -> Tuple[Tuple[str, datetime.datetime], ...]:
+    """Finds dates in text. Results are cached, except for texts without digits
+    (e.g. 'today') which depend on the current date.
+
+    Args:
+        txt (str): Text with dates
+
+    Returns:
+        Tuple[Tuple[str, datetime.datetime], ...]: Pairs of date text and parsed date,
+                                                   empty if no date was found
+    """
+    if _HAS_DIGIT.search(txt):
+        return _cached_search(txt)
+    return _cached_search.__wrapped__(txt)
 
 
 
 def datadigger_by_name(fname: str, lname: str,
-    line_delimiter='\n', date_format='%Y-%m-%d') -> Tuple[str, List]:
+    line_delimiter='\n', date_format='%Y-%m-%d') -> Tuple[bytes, List]:
     """Load and parse search page for given first and last name
 
     Args:
@@ -158,16 +240,15 @@ def datadigger_by_name(fname: str, lname: str,
 
 
     Returns:
-        Tuple[str, List]: Raw HTML from search page, List of parsed data
+        Tuple[bytes, List]: Raw HTML from search page, List of parsed data
     """
-    query_url = urlparse(SEARCH_URL) \
-        ._replace(query=f"q={fname.strip().upper()}+{lname.strip().upper()}").geturl()
+    query_url = complete_url_with_names(fname, lname)
     logging.info("Query: %s", query_url)
-    page = requests.get(query_url)
+    page = SESSION.get(query_url, timeout=REQUEST_TIMEOUT)
     results = []
 
     if page.status_code==200:
-        soup = BeautifulSoup(page.content, 'html.parser')
+        soup = BeautifulSoup(page.content, 'lxml')
         for j, result_body in enumerate(soup.find_all(attrs={'class': 'result-body'})):
             if j > MAX_RESULTS_ON_SEARCH_PAGE:
                 logging.error("Too many results on search page. Number exceeds %d",
@@ -180,36 +261,81 @@ def datadigger_by_name(fname: str, lname: str,
 
             res['display_text'] = line_delimiter.join(result_body.stripped_strings)
 
-            if (find_home := result_body.find(attrs={'class': 'fa-home'})):
+            # collect home, email and phone icons in a single pass, first one per class wins
+            icons = {}
+            for icon in result_body.find_all(class_=_ICON_CLASS):
+                for icon_class in filter(_ICON_CLASS.match, icon.get('class', [])):
+                    icons.setdefault(icon_class, icon)
+
+            if (find_home := icons.get('fa-home')):
                 res['home_address'] = parent_text_with_nl(find_home, delimiter=line_delimiter)
 
-            if (find_email := result_body.find(attrs={'class': 'fa-envelope'})):
+            if (find_email := icons.get('fa-envelope')):
                 res['email_address'] = next_text_only(find_email)
 
-            if (find_phone := result_body.find(attrs={'class': 'fa-phone'})):
+            if (find_phone := icons.get('fa-phone')):
                 res['phone_number'] = next_text_only(find_phone)
 
             for rsb in result_body.children:
                 if rsb.name:
                     txt = rsb.text.strip()
-                    if 'born' in txt.lower():
-                        srd = search_dates(txt)
-                        if len(srd)>0:
-                            res['birth_date'] = search_dates(txt)[0][1].strftime(date_format)
-                            res['birth_date_text'] = search_dates(txt)[0][0]
-                    elif 'updated' in txt.lower():
-                        srd = search_dates(txt)
-                        if len(srd)>0:
-                            res['updated_date'] = search_dates(txt)[0][1].strftime(date_format)
-                            res['updated_date_text'] = search_dates(txt)[0][0]
+                    kind = 'born' if _BORN.search(txt) else \
+                           'updated' if _UPDATED.search(txt) else None
+                    if not kind:
+                        continue
+                    if not (srd := search_date_strings(txt)):
+                        continue
+                    date_text, date_value = srd[0]
+                    if kind == 'born':
+                        res['birth_date'] = date_value.strftime(date_format)
+                        res['birth_date_text'] = date_text
+                    else:
+                        res['updated_date'] = date_value.strftime(date_format)
+                        res['updated_date_text'] = date_text
 
             results.append(res)
 
-    return page.text, results
+    return page.content, results
+
 
 
+def html_file_exists(html_name: str) -> bool:
+    """Checks if page was already scraped. Pages are stored gzip compressed,
+    older runs stored them uncompressed without the '.gz' suffix.
 
-def scrape_by_name(fname, lname, sleep_time = (1, 3), line_delimiter='\n', date_format='%Y-%m-%d'):
+    Args:
+        html_name (str): Name of compressed HTML file
+
+    Returns:
+        bool: True if the compressed or uncompressed file exists
+    """
+    return os.path.isfile(html_name) or os.path.isfile(html_name[:-len('.gz')])
+
+
+def write_html(html_name: str, html: bytes):
+    """Writes raw HTML gzip compressed
+
+    Args:
+        html_name (str): Name of compressed HTML file
+        html (bytes): Raw HTML
+    """
+    with gzip.open(html_name, "wb", compresslevel=HTML_COMPRESSLEVEL) as html_io:
+        html_io.write(html)
+
+
+def clean_name(name: str) -> str:
+    """Converts name into the form used for output directories and file names
+
+    Args:
+        name (str): First or last name
+
+    Returns:
+        str: Lower case name, special characters replaced by '_'
+    """
+    return _NON_WORD.sub('_', name.lower().strip())
+
+
+def scrape_by_name(fname, lname, sleep_time=None, line_delimiter='\n', date_format='%Y-%m-%d'):
     """Scrape search page for given first and last name. There can be multiple records per page.
     For each request two files are created:
     html: contains the raw web-page
@@ -220,51 +346,75 @@ def scrape_by_name(fname, lname, sleep_time = (1, 3), line_delimiter='\n', date_
     Args:
         fname (str): First name of person
         lname (str): Last name of person
-        sleep_time (tuple, optional): Number of seconds to sleep between requests is randomly picked
-                                      from this interval. Defaults to (3, 17).
+        sleep_time (tuple, optional): Number of seconds to sleep before the request is randomly
+                                      picked from this interval. Defaults to None, no sleep;
+                                      run_concurrently paces requests with a RateLimiter.
         line_delimiter (str, optional): Delimiter for line-breaks within a data valaue.
                                         Defaults to '\n'.
         date_format (str, optional): Formatting string for datetime objects. Defaults to '%Y-%m-%d'.
     """
-    output_fname = re.sub(r'[\W]', '_', fname.lower().strip())
-    output_lname = re.sub(r'[\W]', '_', lname.lower().strip())
+    output_fname = clean_name(fname)
+    output_lname = clean_name(lname)
     output_path = os.path.join(SCRAPING_SEARCH_DIR, 'json', output_lname)
     output_name = os.path.join(output_path, f"{output_fname}.json")
 
     html_path = os.path.join(SCRAPING_SEARCH_DIR, 'html', output_lname)
-    html_name = os.path.join(html_path, f"{output_fname}.html")
+    html_name = os.path.join(html_path, f"{output_fname}.html.gz")
     logging.info("File: %s", output_name)
 
-    if os.path.isfile(html_name):
+    if html_file_exists(html_name):
         logging.info("Skip %s %s, file %s already exists.", fname, lname, html_name)
         return
 
     for pth in [output_path, html_path]:
-        if not os.path.isdir(pth):
-            os.makedirs(pth)
+        os.makedirs(pth, exist_ok=True)
 
-    time.sleep(random.randint(*sleep_time))
+    if sleep_time:
+        time.sleep(random.randint(*sleep_time))
 
     html, results = datadigger_by_name(fname, lname,
                                         line_delimiter=line_delimiter, date_format=date_format)
-    with open(html_name, "w", encoding="utf8") as html_io:
-        html_io.write(html)
+    write_html(html_name, html)
 
     if len(results)>0:
         logging.info("Number or records: %d", len(results))
-        with open(output_name, "w", encoding="utf8") as json_io:
-            for j, res in enumerate(results):
-                res['order_number'] = j
-                res['first_name'] = fname
-                res['last_name'] = lname
-                res['json_file'] = output_name
-                res['scrape_date'] = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
-                json_io.write(json.dumps(res))
-                json_io.write('\n')
+        scrape_date = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+        for j, res in enumerate(results):
+            res['order_number'] = j
+            res['first_name'] = fname
+            res['last_name'] = lname
+            res['json_file'] = output_name
+            res['scrape_date'] = scrape_date
+        with open(output_name, "wb") as json_io:
+            json_io.write(b'\n'.join(map(orjson.dumps, results)) + b'\n')
     else:
         logging.warning("No records for %s %s", fname, lname)
 
 
+def scraped_names() -> set:
+    """Collects names for which the search page was already scraped, so that they
+    can be skipped without checking the file system one by one.
+
+    Returns:
+        set: Pairs of clean last and first name
+    """
+    done = set()
+    html_dir = os.path.join(SCRAPING_SEARCH_DIR, 'html')
+    if not os.path.isdir(html_dir):
+        return done
+    with os.scandir(html_dir) as last_entries:
+        for last in last_entries:
+            if not last.is_dir():
+                continue
+            with os.scandir(last.path) as first_entries:
+                for first in first_entries:
+                    for suffix in ['.html.gz', '.html']:
+                        if first.name.endswith(suffix):
+                            done.add((last.name, first.name[:-len(suffix)]))
+                            break
+    return done
+
+
 #   ____       _        _ _
 #  |  _ \  ___| |_ __ _(_) |___
 #  | | | |/ _ \ __/ _` | | / __|
@@ -272,6 +422,37 @@ def scrape_by_name(fname, lname, sleep_time = (1, 3), line_delimiter='\n', date_
 #  |____/ \___|\__\__,_|_|_|___/
 
 
+def _xpath_with_class(axis: str, class_name: str, position='') -> etree.XPath:
+    return etree.XPath(f"{axis}[contains(concat(' ', normalize-space(@class), ' '), "
+                       f"' {class_name} ')]{position}")
+
+
+PROFILE_HEADERS_XP = _xpath_with_class("//*", 'profile-header')
+PROFILE_BODY_XP = etree.XPath("(descendant::div | following::div)[1]")
+CONTAINER_HEADERS_XP = _xpath_with_class("//*", 'page-container-header')
+CONTAINER_BODY_XP = _xpath_with_class("(descendant::div | following::div)",
+                                      'page-container-body', '[1]')
+LABELS_XP = _xpath_with_class("descendant::*", 'profile-info-label')
+VALUE_XP = _xpath_with_class("(descendant::* | following::*)", 'profile-info-value', '[1]')
+
+
+def html_parser_for(page: requests.Response) -> lxml.html.HTMLParser:
+    """Creates lxml parser for the encoding of the page. The charset from the HTTP header
+    is used if given, otherwise it is detected like BeautifulSoup does (meta tag, then
+    content). Without this libxml2 decodes pages without meta charset as Latin-1.
+
+    Args:
+        page (requests.Response): Response with raw HTML
+
+    Returns:
+        lxml.html.HTMLParser: Parser for the detected encoding
+    """
+    header_charset = 'charset=' in page.headers.get('content-type', '').lower()
+    known_encodings = [page.encoding] if header_charset and page.encoding else []
+    dammit = UnicodeDammit(page.content, known_encodings, is_html=True)
+    return lxml.html.HTMLParser(encoding=dammit.original_encoding or 'utf-8')
+
+
 def clean_label(label: str) -> str:
     """Removes and replaces special characters to form 'clean' label strings
 
@@ -281,14 +462,12 @@ def clean_label(label: str) -> str:
     Returns:
         str: String to be used as key in dict
     """
-    l_1 = label.getText().strip().replace(':', '')
-    l_2 = re.sub(r'[\W]', '_', l_1)
-    l_3 = re.sub(r'[_+]', '_', l_2)
-    return l_3.lower()
+    l_1 = label.strip().replace(':', '')
+    return _NON_WORD.sub('_', l_1).lower()
 
 
 def datadigger_detail_page(detail_url: str,
-                           line_delimiter='\n', date_format='%Y-%m-%d') -> Tuple[str, Dict]:
+                           line_delimiter='\n', date_format='%Y-%m-%d') -> Tuple[bytes, Dict]:
     """Request and parse detail page for given URL.
 
     Args:
@@ -298,44 +477,42 @@ def datadigger_detail_page(detail_url: str,
         date_format (str, optional): Formatting string for datetime objects. Defaults to '%Y-%m-%d'.
 
     Returns:
-        Tuple[str, Dict]: Raw HTML code, structure of parsed data
+        Tuple[bytes, Dict]: Raw HTML code, structure of parsed data
     """
 
-    page = requests.get(detail_url)
+    page = SESSION.get(detail_url, timeout=REQUEST_TIMEOUT)
     attributes = {}
 
     if page.status_code==200:
-        soup = BeautifulSoup(page.content, 'html.parser')
+        tree = lxml.html.fromstring(page.content, parser=html_parser_for(page))
 
         ### Profile
         attributes['profile'] = {}
-        profile_header = list(filter(lambda x: 'Additional Information' in x.text,
-                                        soup.find_all(attrs={'class':'profile-header'})))[0]
-        for label in profile_header.find_next('div') \
-                                   .find_all(attrs={'class': 'profile-info-label'}):
-            key = clean_label(label)
-            value = text_with_nl(label.find_next(attrs={'class': 'profile-info-value'}))
-            if key in ['born'] and (prsdt := parse_dates(value)):
-                value = prsdt.strftime(date_format)
+        profile_header = list(filter(lambda x: 'Additional Information' in x.text_content(),
+                                     PROFILE_HEADERS_XP(tree)))[0]
+        for label in LABELS_XP(PROFILE_BODY_XP(profile_header)[0]):
+            key = clean_label(label.text_content())
+            value = text_with_nl(VALUE_XP(label)[0])
+            if key in ['born'] and (prsdt := parse_date_string(value, date_format)):
+                value = prsdt
             attributes['profile'][key] = value
 
         ### Voter Registration Details
         attributes['voter_registrations'] = []
         for container_header in \
-                    list(filter(lambda x: 'Voter Registration' in x.text,
-                                soup.find_all(attrs={'class':'page-container-header'}))):
-            vr_date_text, vr_date = search_dates(container_header.getText())[0]
+                    list(filter(lambda x: 'Voter Registration' in x.text_content(),
+                                CONTAINER_HEADERS_XP(tree))):
+            vr_date_text, vr_date = search_date_strings(container_header.text_content())[0]
 
-            container_body = container_header \
-                .find_next('div', attrs={'class': 'page-container-body'})
+            container_body = CONTAINER_BODY_XP(container_header)[0]
             vr_attr = {}
 
-            for label in container_body.find_all(attrs={'class': 'profile-info-label'}):
-                key = clean_label(label)
-                value = text_with_nl(label.find_next(attrs={'class': 'profile-info-value'}),
-                                     delimiter=line_delimiter)
-                if key in ['birthdate', 'registration'] and (prsdt := parse_dates(value)):
-                    value = prsdt.strftime(date_format)
+            for label in LABELS_XP(container_body):
+                key = clean_label(label.text_content())
+                value = text_with_nl(VALUE_XP(label)[0], delimiter=line_delimiter)
+                if key in ['birthdate', 'registration'] and \
+                        (prsdt := parse_date_string(value, date_format)):
+                    value = prsdt
 
                 vr_attr[key] = value
 
@@ -344,11 +521,26 @@ def datadigger_detail_page(detail_url: str,
                 'voter_registration_date_text': vr_date_text,
                 'voter_registration_attributes': vr_attr
             })
-    return page.text, attributes
+    return page.content, attributes
+
+
+def details_file_names(detail_url: str) -> Tuple[str, str]:
+    """Produces output file names for details page
+
+    Args:
+        detail_url (str): URL of details page, from search table
+
+    Returns:
+        Tuple[str, str]: Name of JSON file, name of compressed HTML file
+    """
+    path_parts = urlparse(detail_url).path.split('/')
+    pname = os.path.join('/'.join(path_parts[1:3]), f"{'_'.join(path_parts[3:])}")
+    return (os.path.join(SCRAPING_DETAILS_DIR, 'json', f"{pname}.json"),
+            os.path.join(SCRAPING_DETAILS_DIR, 'html', f"{pname}.html.gz"))
 
 
 def scrape_details(detail_url: str,
-                   sleep_time = (1, 3), line_delimiter='\n', date_format='%Y-%m-%d'):
+                   sleep_time=None, line_delimiter='\n', date_format='%Y-%m-%d'):
     """Scrape details page for given URL. Parse data. For each request two files are created:
     html: contains the raw web-page
     json: contains a JSON record of the parsed data
@@ -357,44 +549,39 @@ def scrape_details(detail_url: str,
 
     Args:
         detail_url (str): URL of details page, from search table
-        sleep_time (tuple, optional): Number of seconds to sleep between requests is randomly picked
-                                      from this interval. Defaults to (3, 17).
+        sleep_time (tuple, optional): Number of seconds to sleep before the request is randomly
+                                      picked from this interval. Defaults to None, no sleep;
+                                      run_concurrently paces requests with a RateLimiter.
         line_delimiter (str, optional): Delimiter for line-breaks within a data valaue.
                                         Defaults to '\n'.
         date_format (str, optional): Formatting string for datetime objects. Defaults to '%Y-%m-%d'.
     """
 
-    path_parts = urlparse(detail_url).path.split('/')
-    pname = os.path.join('/'.join(path_parts[1:3]), f"{'_'.join(path_parts[3:])}")
-    output_name = os.path.join(SCRAPING_DETAILS_DIR, 'json', f"{pname}.json")
+    output_name, html_name = details_file_names(detail_url)
     output_path = os.path.dirname(output_name)
-
-    html_name = os.path.join(SCRAPING_DETAILS_DIR, 'html', f"{pname}.html")
     html_path = os.path.dirname(html_name)
     logging.info("File: %s", output_name)
 
-    if os.path.isfile(html_name):
+    if html_file_exists(html_name):
         logging.info("Skip %s, file %s already exists.", detail_url, html_name)
         return
 
     for pth in [output_path, html_path]:
-        if not os.path.isdir(pth):
-            os.makedirs(pth)
+        os.makedirs(pth, exist_ok=True)
 
-    time.sleep(random.randint(*sleep_time))
+    if sleep_time:
+        time.sleep(random.randint(*sleep_time))
 
     html, results = datadigger_detail_page(detail_url,
                                            line_delimiter=line_delimiter, date_format=date_format)
-    with open(html_name, "w", encoding="utf8") as html_io:
-        html_io.write(html)
+    write_html(html_name, html)
 
     if results:
-        with open(output_name, "w", encoding="utf8") as json_io:
+        with open(output_name, "wb") as json_io:
             results['detail_url'] = detail_url
             results['json_file'] = output_name
             results['scrape_date'] = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
-            json_io.write(json.dumps(results))
-            json_io.write('\n')
+            json_io.write(orjson.dumps(results) + b'\n')
     else:
         logging.warning("No records for %s", detail_url)
 
@@ -406,22 +593,47 @@ def scrape_details(detail_url: str,
 #  |____/ \__,_|\__\__,_|
 
 
+def load_json_lines(data_file: str, columns: Optional[List[str]] = None) -> List:
+    """Reads file with one JSON record per line. The file is streamed line by line,
+    blank lines are skipped.
+
+    Args:
+        data_file (str): Path of JSON file
+        columns (List[str], optional): If given, each record is returned as tuple of these
+                                       fields, missing fields are None. Defaults to None.
+
+    Returns:
+        List: Records from file, as dicts or tuples
+    """
+    with open(data_file, 'rb') as json_io:
+        records = (orjson.loads(line) for line in json_io if not line.isspace())
+        if columns is None:
+            return list(records)
+        return [tuple(map(rec.get, columns)) for rec in records]
+
+
 def load_search_results() -> pd.DataFrame:
     """Collect records from original JSON files and creates table with search results
 
     Returns:
         pd.DataFrame: Table with search results
     """
+    data_files = []
+    with os.scandir(os.path.join(SCRAPING_SEARCH_DIR, 'json')) as last_entries:
+        for last in last_entries:
+            if not last.is_dir():
+                continue
+            with os.scandir(last.path) as first_entries:
+                data_files.extend(first.path for first in first_entries
+                                  if first.name.endswith('.json') and first.is_file())
+    num_files = len(data_files)
+
     data = []
-    num_files = 0
-    for last in os.listdir(os.path.join(SCRAPING_SEARCH_DIR, 'json')):
-        for first in os.listdir(os.path.join(SCRAPING_SEARCH_DIR, 'json', last)):
-            data_file = os.path.join(SCRAPING_SEARCH_DIR, 'json', last, first)
-            if data_file.endswith('.json'):
-                num_files += 1
-                data.extend(map(json.loads, open(data_file, encoding="utf-8").readlines()))
-
-    search_df = pd.DataFrame(data)
+    with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as executor:
+        for records in executor.map(partial(load_json_lines, columns=SEARCH_COLUMNS), data_files):
+            data.extend(records)
+
+    search_df = pd.DataFrame.from_records(data, columns=SEARCH_COLUMNS)
     search_df.attrs.update({
         'data_source': SCRAPING_SEARCH_DIR,
         'number_of_files': num_files,
@@ -465,31 +677,100 @@ class GracefulTerminate:
         self.terminate_now = True
 
 
+class RateLimiter:
+    """Spreads requests evenly at a given average rate across all workers. Unlike a fixed
+    sleep per request, workers only wait when requests come in faster than the rate.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next = 0.0
+
+    async def acquire(self):
+        """Reserve next time slot and wait for it
+        """
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + 1/self.rate
+        await asyncio.sleep(slot - now)
+
+
+async def run_concurrently(func: Callable, jobs: Iterable[Tuple], terminate: GracefulTerminate,
+                           num_workers=MAX_CONCURRENT_REQUESTS, rate=REQUESTS_PER_SECOND):
+    """Run blocking scraping function for each job with a bounded number of concurrent workers.
+    Each worker hands the request and parsing to a thread pool, so the event loop only
+    schedules jobs. New jobs are no longer started once termination is requested.
+
+    Args:
+        func (Callable): Blocking function, e.g. scrape_by_name or scrape_details
+        jobs (Iterable[Tuple]): Positional arguments for each call of func
+        terminate (GracefulTerminate): Termination flag, checked before every job
+        num_workers (int, optional): Number of concurrent requests.
+                                     Defaults to MAX_CONCURRENT_REQUESTS.
+        rate (float, optional): Average number of requests per second.
+                                Defaults to REQUESTS_PER_SECOND.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=2*num_workers)
+    limiter = RateLimiter(rate)
+
+    async def worker(executor):
+        while (args := await queue.get()) is not None:
+            if terminate.terminate_now:
+                continue
+            await limiter.acquire()
+            # termination may have been requested while waiting for the time slot
+            if terminate.terminate_now:
+                continue
+            try:
+                await loop.run_in_executor(executor, func, *args)
+            except Exception as ex:
+                logging.error("Exception: %s", str(ex))
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        workers = [asyncio.create_task(worker(executor)) for _ in range(num_workers)]
+        for args in jobs:
+            if terminate.terminate_now:
+                break
+            await queue.put(args)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+
 def main_search():
     """Scrape search pages for names given in input table
     """
 
     logging.info('Started')
-    names_df = pd.read_csv(os.path.join(INPUT_DATA_DIR, "final_race.csv")) \
+    names_df = pd.read_csv(os.path.join(INPUT_DATA_DIR, "final_race.csv"),
+                           dtype={'f_name': str, 'l_name': str}) \
                  .dropna(subset=['f_name', 'l_name'])
     logging.info("Number of records: %d", names_df.shape[0])
-    terminate = GracefulTerminate()
 
-    for j, row in names_df.iterrows():
-        if terminate.terminate_now:
-            break
-        #         if j>5: break
+    # names are read as strings, blank names are reported as invalid
+    names_df['f_clean'] = names_df['f_name'].str.strip()
+    names_df['l_clean'] = names_df['l_name'].str.strip()
+    valid = (names_df['f_clean'].str.len()>0) & (names_df['l_clean'].str.len()>0)
+    for f_name, l_name in names_df.loc[~valid, ['f_clean', 'l_clean']] \
+                                  .itertuples(index=False, name=None):
+        logging.warning("Invalid record: '%s' '%s'", f_name, l_name)
+    names_df = names_df[valid]
+
+    done = scraped_names()
+    logging.info("Number of names already scraped: %d", len(done))
+    terminate = GracefulTerminate()
 
-        l_name = row['l_name'].strip() if isinstance(row['l_name'], str) else ''
-        f_name = row['f_name'].strip() if isinstance(row['f_name'], str) else ''
+    def search_jobs():
+        for f_name, l_name in names_df[['f_clean', 'l_clean']].itertuples(index=False, name=None):
+            key = (clean_name(l_name), clean_name(f_name))
+            if key in done:
+                continue
+            # concurrent workers would fetch duplicate names at the same time
+            done.add(key)
+            yield f_name, l_name
 
-        if len(l_name)>0 and len(f_name)>0:
-            try:
-                scrape_by_name(f_name, l_name)
-            except Exception as ex:
-                logging.error("Exception: %s", str(ex))
-        else:
-            logging.warning("Invalid record: '%s' '%s'", f_name, l_name)
+    asyncio.run(run_concurrently(scrape_by_name, search_jobs(), terminate))
     logging.info('Finished')
 
 
@@ -504,20 +785,18 @@ def main_details(url_list_file: str):
     logging.info("Number of records: %d", len(details_list))
     terminate = GracefulTerminate()
 
-    # for j, row in details_df.iterrows():
-    for j, detail_url in enumerate(details_list):
-        if terminate.terminate_now:
-            break
-        # if j>100: break
-
-#         detail_url = row['detail_url']
-        if len(detail_url)>0:
-            try:
-                scrape_details(detail_url)
-            except Exception as ex:
-                logging.error("Exception: %s", ex)
-        else:
-            logging.warning("Invalid record: '%s'", str(row['display_text']))
+    def details_jobs():
+        seen = set()
+        for detail_url in details_list:
+            html_name = details_file_names(detail_url)[1]
+            # skip duplicates and pages already on disk here, concurrent workers would
+            # fetch duplicates at the same time and they would use up rate limiter slots
+            if html_name in seen or html_file_exists(html_name):
+                continue
+            seen.add(html_name)
+            yield (detail_url,)
+
+    asyncio.run(run_concurrently(scrape_details, details_jobs(), terminate))
     logging.info('Finished')
 
 
@@ -539,7 +818,7 @@ def main_process_data():
         print(f"Number of search records: {search_df.shape[0]:,}")
 
     data_file = os.path.join(DATA_DIR, 'search_results.csv')
-    search_df.to_csv(data_file, index=None)
+    pcsv.write_csv(pa.Table.from_pandas(search_df, preserve_index=False), data_file)
     logging.info('Finished')
     print(f"Updated data are ready in {data_file}")
 
@@ -2,11 +2,14 @@
 
 import os
 import sys
+import glob
+import subprocess
 import time
 import random
 import json
 import re
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import datetime
 
@@ -62,6 +65,14 @@ web_scrape_timestamp = int(web_scrape_datetime.timestamp())
 web_scrape_isodate = web_scrape_datetime.isoformat()
 web_scrape_path = web_scrape_datetime.strftime("%Y/%m%d/%H%M")
 
+user_agent = "Mozilla/5.0 (X11; Linux x86_64; rv:102.0) Gecko/20100101 Firefox/102.0"
+request_timeout = 30
+
+## one session for all page requests, keeps the connection to kickstarter.com alive
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+session.headers.update({'User-Agent': user_agent})
+
 
 def info(msg):
     now_local = datetime.datetime.now().isoformat
@@ -81,7 +92,7 @@ def scraping(sections=None, anyState=True, limit=0):
     def get_pages_yield_soup(base_url):
         
         page_number = 1
-        page = requests.get(f"{base_url}&page={page_number}")
+        page = session.get(f"{base_url}&page={page_number}", timeout=request_timeout)
 
         while page.status_code == 200:
             info(f"Page Number: {page_number:,}")
@@ -90,7 +101,7 @@ def scraping(sections=None, anyState=True, limit=0):
             page_number += 1
             random_sleep_time = 1.7+90*random.random()
             time.sleep(random_sleep_time)
-            page = requests.get(f"{base_url}&page={page_number}")
+            page = session.get(f"{base_url}&page={page_number}", timeout=request_timeout)
 
     
     if sections is None:
@@ -126,8 +137,7 @@ def scraping(sections=None, anyState=True, limit=0):
 
                     category = clean_category_string(data['category']['slug'])
                     dest_dir = os.path.join(data_dir, web_scrape_path, category, f"{pid}")
-                    res = os.system(f"mkdir -p {dest_dir}")
-                    assert res==0, F"Failed to create `{dest_dir}`"
+                    os.makedirs(dest_dir, exist_ok=True)
 
                     data['web_scrape_timestamp'] = web_scrape_timestamp
                     data['web_scrape_isodate'] = web_scrape_isodate
@@ -145,8 +155,12 @@ def hdfs_upload():
     ld = os.path.join(data_dir, web_scrape_path)
     hd = os.path.join(hdfs_dir, web_scrape_path)
     info(f"Upload to hdfs://{hd}")
-    os.system(f"hdfs dfs -mkdir -p {hd}")
-    os.system(f"hdfs dfs -put {ld}/* {hd}")
+    local_paths = sorted(glob.glob(os.path.join(ld, '*')))
+    if not local_paths:
+        info(f"Nothing to upload in {ld}")
+        return
+    subprocess.run(["hdfs", "dfs", "-mkdir", "-p", hd], check=True)
+    subprocess.run(["hdfs", "dfs", "-put", *local_paths, hd], check=True)
         
 
 if __name__ == '__main__':
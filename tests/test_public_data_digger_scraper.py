@@ -0,0 +1,44 @@
+import public_data_digger_scraper as scraper
+
+
+class FakeResponse:
+    """Stand-in for requests.Response with the attributes the scraper uses"""
+
+    def __init__(self, content: bytes, content_type: str):
+        self.status_code = 200
+        self.content = content
+        self.headers = {'content-type': content_type}
+        self.encoding = 'utf-8' if 'charset=utf-8' in content_type else 'ISO-8859-1'
+
+
+DETAIL_PAGE = """<html><body>
+<h3 class="profile-header">Additional Information</h3>
+<div class="profile-user-info">
+  <div class="profile-info-label">Name:</div><div class="profile-info-value">José Muñoz</div>
+</div>
+<div class="page-container-header">Voter Registration 2020-01-02</div>
+<div class="page-container-body">
+  <div class="profile-info-label">City</div><div class="profile-info-value">Peñasco</div>
+</div>
+</body></html>"""
+
+
+def scrape_detail_page(monkeypatch, response):
+    monkeypatch.setattr(scraper.SESSION, 'get', lambda url, timeout: response)
+    return scraper.datadigger_detail_page("https://publicdatadigger.com/voter/x/y")[1]
+
+
+def check_non_ascii_values(attributes):
+    assert attributes['profile'] == {'name': 'José Muñoz'}
+    assert attributes['voter_registrations'][0]['voter_registration_attributes'] \
+        == {'city': 'Peñasco'}
+
+
+def test_detail_page_charset_from_header_only(monkeypatch):
+    response = FakeResponse(DETAIL_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+    check_non_ascii_values(scrape_detail_page(monkeypatch, response))
+
+
+def test_detail_page_without_any_charset(monkeypatch):
+    response = FakeResponse(DETAIL_PAGE.encode('utf-8'), 'text/html')
+    check_non_ascii_values(scrape_detail_page(monkeypatch, response))